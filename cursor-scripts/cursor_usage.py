@@ -6,6 +6,7 @@ Track and analyze Cursor AI usage over time.
 
 Usage:
     python cursor-scripts/cursor_usage.py import [file.csv]  # Import CSV (or all in cursor-usage/)
+    python cursor-scripts/cursor_usage.py import --fast      # Bulk-load via the sqlite3 CLI
     python cursor-scripts/cursor_usage.py report             # Show usage report
     python cursor-scripts/cursor_usage.py report --days 7    # Last 7 days
     python cursor-scripts/cursor_usage.py report --model     # By model breakdown
@@ -22,14 +23,11 @@ Usage:
 """
 
 import argparse
-import csv
-import json
-import re
+import os
 import sqlite3
 import sys
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from pathlib import Path
-from collections import defaultdict
 
 # Paths
 SCRIPT_DIR = Path(__file__).parent
@@ -39,6 +37,7 @@ DB_PATH = USAGE_DIR / "usage.db"
 REMINDER_STATE_PATH = USAGE_DIR / ".reminder_last_date"
 DATE_FMT_INPUT = "%Y-%d-%m"
 DATE_FMT_DISPLAY = "%Y-%d-%m"
+USAGE_CSV_PREFIX = "usage-events-"  # Cursor export filename: usage-events-YYYY-MM-DD.csv
 
 # Billing cycle configuration
 DEFAULT_BILLING_DAY = 14  # Day of month when billing cycle resets
@@ -47,6 +46,16 @@ DEFAULT_BILLING_DAY = 14  # Day of month when billing cycle resets
 KIND_ON_DEMAND = "On-Demand"
 KIND_INCLUDED = "Included"
 
+# Cursor CSV export columns, in usage_events insert order
+CSV_COLUMNS = (
+    'Date', 'Kind', 'Model', 'Max Mode',
+    'Input (w/ Cache Write)', 'Input (w/o Cache Write)', 'Cache Read',
+    'Output Tokens', 'Total Tokens', 'Cost',
+)
+
+# Connection shared by everything in one CLI invocation (see get_db/close_db)
+_DB = None
+
 
 def format_tokens(tokens: int) -> str:
     """Format token count for display (e.g., 65100000 -> '65.1M')."""
@@ -60,10 +69,39 @@ def format_tokens(tokens: int) -> str:
         return str(tokens)
 
 
+def write_lines(lines: list) -> None:
+    """Write table rows with a single stdout write instead of a print() per row."""
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
+
+
+def to_epoch(dt: datetime) -> int:
+    """Epoch seconds for a datetime, matching SQLite's strftime('%s') on stored timestamps.
+
+    Naive datetimes are read as UTC wall-clock time, which keeps window bounds
+    where the old ISO-string comparisons put them.
+    """
+    if dt.tzinfo is None:
+        import calendar
+        return calendar.timegm(dt.timetuple())
+    return int(dt.timestamp())
+
+
 def get_db():
-    """Get database connection, creating tables if needed."""
+    """Get the shared database connection, creating tables on first use."""
+    global _DB
+    if _DB is not None:
+        return _DB
+
+    USAGE_DIR.mkdir(exist_ok=True)
     db = sqlite3.connect(DB_PATH)
     db.row_factory = sqlite3.Row
+    # WAL + synchronous=NORMAL: one fsync per checkpoint instead of per commit
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")
+    db.execute("PRAGMA temp_store=MEMORY")
+    db.execute("PRAGMA cache_size=-65536")  # 64 MiB
+    db.execute("PRAGMA mmap_size=268435456")  # 256 MiB
     db.execute("""
         CREATE TABLE IF NOT EXISTS usage_events (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -77,59 +115,200 @@ def get_db():
             output_tokens INTEGER,
             total_tokens INTEGER,
             cost REAL,
-            imported_at TEXT
+            imported_at TEXT,
+            ts_epoch INTEGER
         )
     """)
+    columns = {r['name'] for r in db.execute("PRAGMA table_info(usage_events)")}
+    if 'ts_epoch' not in columns:
+        # Databases created before ts_epoch existed: add and backfill it
+        db.execute("ALTER TABLE usage_events ADD COLUMN ts_epoch INTEGER")
+        db.execute("UPDATE usage_events SET ts_epoch = CAST(strftime('%s', timestamp) AS INTEGER)")
     db.execute("""
         CREATE INDEX IF NOT EXISTS idx_timestamp ON usage_events(timestamp)
     """)
     db.execute("""
         CREATE INDEX IF NOT EXISTS idx_model ON usage_events(model)
     """)
+    # Covering index for the windowed aggregates: integer range on ts_epoch,
+    # everything else (model, kind, cost, tokens) read from the index itself
+    db.execute("""
+        CREATE INDEX IF NOT EXISTS idx_ts_epoch
+        ON usage_events(ts_epoch, model, kind, cost, total_tokens)
+    """)
+    # Per-day totals maintained at import time for report_daily/report_weekly
+    db.execute("""
+        CREATE TABLE IF NOT EXISTS daily_rollup (
+            date TEXT PRIMARY KEY,
+            count INTEGER,
+            cost REAL,
+            tokens INTEGER
+        )
+    """)
+    if db.execute("SELECT 1 FROM daily_rollup LIMIT 1").fetchone() is None:
+        # Backfill databases created before the rollup existed
+        update_daily_rollup(db, 0)
     db.commit()
+    _DB = db
     return db
 
 
+def close_db():
+    """Close the shared database connection, if open."""
+    global _DB
+    if _DB is not None:
+        _DB.close()
+        _DB = None
+
+
+def update_daily_rollup(db: sqlite3.Connection, after_id: int):
+    """Fold usage_events rows with id > after_id into daily_rollup."""
+    db.execute("""
+        INSERT INTO daily_rollup (date, count, cost, tokens)
+        SELECT DATE(timestamp), COUNT(*), SUM(cost), SUM(total_tokens)
+        FROM usage_events
+        WHERE id > ?
+        GROUP BY DATE(timestamp)
+        ON CONFLICT(date) DO UPDATE SET
+            count = count + excluded.count,
+            cost = cost + excluded.cost,
+            tokens = tokens + excluded.tokens
+    """, [after_id])
+
+
 def import_csv(csv_path: Path, db: sqlite3.Connection) -> tuple[int, int]:
-    """Import a CSV file into the database. Returns (imported, skipped) counts."""
-    imported = 0
-    skipped = 0
-
-    with open(csv_path, 'r') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            try:
-                db.execute("""
-                    INSERT INTO usage_events (
-                        timestamp, kind, model, max_mode,
-                        input_cache_write, input_no_cache, cache_read,
-                        output_tokens, total_tokens, cost, imported_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    row['Date'],
-                    row['Kind'],
-                    row['Model'],
-                    row['Max Mode'],
-                    int(row['Input (w/ Cache Write)']),
-                    int(row['Input (w/o Cache Write)']),
-                    int(row['Cache Read']),
-                    int(row['Output Tokens']),
-                    int(row['Total Tokens']),
-                    float(row['Cost']),
-                    datetime.now().isoformat()
-                ))
-                imported += 1
-            except sqlite3.IntegrityError:
-                # Duplicate timestamp - skip
-                skipped += 1
+    """Import a CSV file into the database. Returns (imported, skipped) counts.
 
+    All rows go in with one executemany() inside a single transaction;
+    duplicate timestamps are skipped by ON CONFLICT(timestamp) DO NOTHING.
+    """
+    imported_at = datetime.now().isoformat()
+
+    import csv
+
+    with open(csv_path, 'r', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if not header:
+            return 0, 0
+        # Resolve column positions once instead of a dict lookup per field per row
+        (i_date, i_kind, i_model, i_max_mode, i_cache_write, i_no_cache,
+         i_cache_read, i_output, i_total, i_cost) = [header.index(name) for name in CSV_COLUMNS]
+
+        total = 0
+
+        def rows():
+            nonlocal total
+            for row in reader:
+                if not row:
+                    continue
+                total += 1
+                yield (
+                    row[i_date],
+                    row[i_kind],
+                    row[i_model],
+                    row[i_max_mode],
+                    int(row[i_cache_write]),
+                    int(row[i_no_cache]),
+                    int(row[i_cache_read]),
+                    int(row[i_output]),
+                    int(row[i_total]),
+                    float(row[i_cost]),
+                    imported_at,
+                )
+
+        db.execute("BEGIN")
+        last_id = db.execute("SELECT COALESCE(MAX(id), 0) FROM usage_events").fetchone()[0]
+        cur = db.executemany("""
+            INSERT INTO usage_events (
+                timestamp, kind, model, max_mode,
+                input_cache_write, input_no_cache, cache_read,
+                output_tokens, total_tokens, cost, imported_at, ts_epoch
+            ) VALUES (?1, ?2, ?3, ?4, ?5, ?6, ?7, ?8, ?9, ?10, ?11, CAST(strftime('%s', ?1) AS INTEGER))
+            ON CONFLICT(timestamp) DO NOTHING
+        """, rows())
+
+    imported = cur.rowcount
+    skipped = total - imported
+    if imported:
+        update_daily_rollup(db, last_id)
     db.commit()
     return imported, skipped
 
 
-def import_all(specific_file: str = None):
-    """Import CSV files from cursor-usage/ directory."""
-    db = get_db()
+def import_csv_fast(csv_path: Path, db: sqlite3.Connection):
+    """Bulk-load a CSV through the sqlite3 CLI's C importer.
+
+    The CLI loads the raw text into a staging table, then one INSERT ... SELECT
+    moves it into usage_events with the column types cast, skipping duplicate
+    timestamps. Returns
+    (imported, skipped), or None if the sqlite3 CLI is unavailable or fails
+    (a failing .import is reported with the CLI's stderr).
+    """
+    import csv
+    import shutil
+    import subprocess
+
+    sqlite3_cli = shutil.which("sqlite3")
+    if not sqlite3_cli:
+        return None
+
+    with open(csv_path, 'r', newline='') as f:
+        header = next(csv.reader(f), None)
+    if not header:
+        return 0, 0
+    cols = [f"c{header.index(name)}" for name in CSV_COLUMNS]
+
+    db.execute("DROP TABLE IF EXISTS usage_events_staging")
+    db.execute(f"CREATE TABLE usage_events_staging ({', '.join(f'c{i} TEXT' for i in range(len(header)))})")
+    db.commit()
+
+    result = subprocess.run(
+        [sqlite3_cli, str(DB_PATH), f'.import --csv --skip 1 "{csv_path}" usage_events_staging'],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        db.execute("DROP TABLE IF EXISTS usage_events_staging")
+        db.commit()
+        print(f"  (sqlite3 .import failed: {result.stderr.strip() or f'exit {result.returncode}'})")
+        return None
+
+    imported_at = datetime.now().isoformat()
+    db.execute("BEGIN")
+    last_id = db.execute("SELECT COALESCE(MAX(id), 0) FROM usage_events").fetchone()[0]
+    total = db.execute(
+        f"SELECT COUNT(*) FROM usage_events_staging WHERE {cols[0]} != ''"
+    ).fetchone()[0]
+    cur = db.execute(f"""
+        INSERT INTO usage_events (
+            timestamp, kind, model, max_mode,
+            input_cache_write, input_no_cache, cache_read,
+            output_tokens, total_tokens, cost, imported_at, ts_epoch
+        )
+        SELECT
+            {cols[0]}, {cols[1]}, {cols[2]}, {cols[3]},
+            CAST({cols[4]} AS INTEGER), CAST({cols[5]} AS INTEGER), CAST({cols[6]} AS INTEGER),
+            CAST({cols[7]} AS INTEGER), CAST({cols[8]} AS INTEGER), CAST({cols[9]} AS REAL), ?,
+            CAST(strftime('%s', {cols[0]}) AS INTEGER)
+        FROM usage_events_staging
+        WHERE {cols[0]} != ''
+        ON CONFLICT(timestamp) DO NOTHING
+    """, [imported_at])
+    imported = cur.rowcount
+    db.execute("DROP TABLE usage_events_staging")
+    if imported:
+        update_daily_rollup(db, last_id)
+    db.commit()
+    return imported, total - imported
+
+
+def import_all(db: sqlite3.Connection, specific_file: str = None, fast: bool = False):
+    """Import CSV files from cursor-usage/ directory.
+
+    fast: bulk-load through the sqlite3 CLI, falling back to import_csv if it is unavailable.
+    """
+    import shutil
 
     if specific_file:
         files = [Path(specific_file)]
@@ -144,7 +323,16 @@ def import_all(specific_file: str = None):
     total_skipped = 0
 
     for csv_path in files:
-        imported, skipped = import_csv(csv_path, db)
+        result = import_csv_fast(csv_path, db) if fast else None
+        if fast and result is None:
+            if shutil.which("sqlite3"):
+                print("  (using standard import)")
+            else:
+                print("  (sqlite3 CLI unavailable, using standard import)")
+            fast = False
+        if result is None:
+            result = import_csv(csv_path, db)
+        imported, skipped = result
         total_imported += imported
         total_skipped += skipped
         print(f"  {csv_path.name}: {imported} imported, {skipped} skipped (duplicates)")
@@ -155,31 +343,40 @@ def import_all(specific_file: str = None):
     count = db.execute("SELECT COUNT(*) FROM usage_events").fetchone()[0]
     print(f"Database now has {count} records")
 
-    db.close()
 
+def usage_window(db: sqlite3.Connection, days: int = None) -> str:
+    """Return the table/view holding usage for the last `days` days (all time if None).
+
+    With days, (re)creates the temp view `win` so every report in one invocation
+    reads the same window with the same cutoff.
+    """
+    if not days:
+        return "usage_events"
+    cutoff = to_epoch(datetime.now() - timedelta(days=days))
+    db.execute("DROP VIEW IF EXISTS temp.win")
+    db.execute(f"CREATE TEMP VIEW win AS SELECT * FROM usage_events WHERE ts_epoch >= {cutoff:d}")
+    return "win"
 
-def report_summary(days: int = None):
-    """Generate summary report."""
-    db = get_db()
 
-    where_clause = ""
-    params = []
-    if days:
-        cutoff = (datetime.now() - timedelta(days=days)).isoformat()
-        where_clause = "WHERE timestamp >= ?"
-        params = [cutoff]
+def report_summary(db: sqlite3.Connection, days: int = None, source: str = None):
+    """Generate summary report.
 
-    # Overall stats
+    source: table/view from usage_window(); built from days when omitted.
+    """
+    source = source or usage_window(db, days)
+
+    # Overall stats and error count in a single pass
     row = db.execute(f"""
         SELECT 
             COUNT(*) as count,
-            SUM(cost) as total_cost,
-            SUM(total_tokens) as total_tokens,
-            AVG(cost) as avg_cost,
+            TOTAL(cost) as total_cost,
+            COALESCE(SUM(total_tokens), 0) as total_tokens,
+            COALESCE(AVG(cost), 0) as avg_cost,
             SUM(cache_read) as cache_read,
-            SUM(input_cache_write + input_no_cache) as input_tokens
-        FROM usage_events {where_clause}
-    """, params).fetchone()
+            SUM(input_cache_write + input_no_cache) as input_tokens,
+            SUM(CASE WHEN kind LIKE '%Error%' THEN 1 ELSE 0 END) as errors
+        FROM {source}
+    """).fetchone()
 
     period = f"Last {days} days" if days else "All time"
 
@@ -196,31 +393,15 @@ def report_summary(days: int = None):
         cache_ratio = row['cache_read'] / (row['cache_read'] + row['input_tokens']) * 100
         print(f"Cache Hit Ratio: {cache_ratio:.1f}%")
 
-    # Errors
-    if where_clause:
-        error_count = db.execute(f"""
-            SELECT COUNT(*) FROM usage_events 
-            {where_clause} AND kind LIKE '%Error%'
-        """, params).fetchone()[0]
-    else:
-        error_count = db.execute(
-            "SELECT COUNT(*) FROM usage_events WHERE kind LIKE '%Error%'"
-        ).fetchone()[0]
-    print(f"Errors: {error_count}")
-
-    db.close()
+    print(f"Errors: {row['errors'] or 0}")
 
 
-def report_by_model(days: int = None):
-    """Generate report broken down by model."""
-    db = get_db()
+def report_by_model(db: sqlite3.Connection, days: int = None, source: str = None):
+    """Generate report broken down by model.
 
-    where_clause = ""
-    params = []
-    if days:
-        cutoff = (datetime.now() - timedelta(days=days)).isoformat()
-        where_clause = "WHERE timestamp >= ?"
-        params = [cutoff]
+    source: table/view from usage_window(); built from days when omitted.
+    """
+    source = source or usage_window(db, days)
 
     rows = db.execute(f"""
         SELECT 
@@ -229,10 +410,10 @@ def report_by_model(days: int = None):
             SUM(cost) as total_cost,
             SUM(total_tokens) as total_tokens,
             AVG(cost) as avg_cost
-        FROM usage_events {where_clause}
+        FROM {source}
         GROUP BY model
         ORDER BY total_cost DESC
-    """, params).fetchall()
+    """).fetchall()
 
     period = f"Last {days} days" if days else "All time"
 
@@ -241,27 +422,24 @@ def report_by_model(days: int = None):
     print("-" * 60)
     print(f"{'Model':<40} | {'Calls':>5} | {'Cost':>8} | {'Avg':>6}")
     print("-" * 60)
-    for row in rows:
-        print(f"{row['model']:<40} | {row['count']:>5} | ${row['total_cost']:>6.2f} | ${row['avg_cost']:.3f}")
+    write_lines([
+        f"{row['model']:<40} | {row['count']:>5} | ${row['total_cost']:>6.2f} | ${row['avg_cost']:.3f}"
+        for row in rows
+    ])
 
-    db.close()
 
-
-def report_daily(days: int = 30):
+def report_daily(db: sqlite3.Connection, days: int = 30):
     """Generate daily breakdown report."""
-    db = get_db()
-
-    cutoff = (datetime.now() - timedelta(days=days)).isoformat()
+    cutoff = (datetime.now() - timedelta(days=days)).date().isoformat()
 
     rows = db.execute("""
-        SELECT 
-            DATE(timestamp) as date,
-            COUNT(*) as count,
-            SUM(cost) as total_cost,
-            SUM(total_tokens) as total_tokens
-        FROM usage_events
-        WHERE timestamp >= ?
-        GROUP BY DATE(timestamp)
+        SELECT
+            date,
+            count,
+            cost as total_cost,
+            tokens as total_tokens
+        FROM daily_rollup
+        WHERE date >= ?
         ORDER BY date DESC
     """, [cutoff]).fetchall()
 
@@ -272,31 +450,29 @@ def report_daily(days: int = 30):
     print("-" * 60)
 
     total_cost = 0
+    lines = []
     for row in rows:
         total_cost += row['total_cost']
-        print(f"{row['date']:<12} | {row['count']:>5} | ${row['total_cost']:>6.2f} | {row['total_tokens']:>12,}")
+        lines.append(f"{row['date']:<12} | {row['count']:>5} | ${row['total_cost']:>6.2f} | {row['total_tokens']:>12,}")
+    write_lines(lines)
 
     print("-" * 60)
     print(f"{'TOTAL':<12} | {sum(r['count'] for r in rows):>5} | ${total_cost:>6.2f}")
 
-    db.close()
 
-
-def report_weekly(weeks: int = 8):
+def report_weekly(db: sqlite3.Connection, weeks: int = 8):
     """Generate weekly breakdown report."""
-    db = get_db()
-
-    cutoff = (datetime.now() - timedelta(weeks=weeks)).isoformat()
+    cutoff = (datetime.now() - timedelta(weeks=weeks)).date().isoformat()
 
     rows = db.execute("""
-        SELECT 
-            strftime('%Y-W%W', timestamp) as week,
-            COUNT(*) as count,
+        SELECT
+            strftime('%Y-W%W', date) as week,
+            SUM(count) as count,
             SUM(cost) as total_cost,
-            SUM(total_tokens) as total_tokens
-        FROM usage_events
-        WHERE timestamp >= ?
-        GROUP BY strftime('%Y-W%W', timestamp)
+            SUM(tokens) as total_tokens
+        FROM daily_rollup
+        WHERE date >= ?
+        GROUP BY week
         ORDER BY week DESC
     """, [cutoff]).fetchall()
 
@@ -306,91 +482,102 @@ def report_weekly(weeks: int = 8):
     print(f"{'Week':<12} | {'Calls':>5} | {'Cost':>8} | {'Tokens':>12}")
     print("-" * 60)
 
-    for row in rows:
-        print(f"{row['week']:<12} | {row['count']:>5} | ${row['total_cost']:>6.2f} | {row['total_tokens']:>12,}")
+    write_lines([
+        f"{row['week']:<12} | {row['count']:>5} | ${row['total_cost']:>6.2f} | {row['total_tokens']:>12,}"
+        for row in rows
+    ])
 
-    db.close()
+
+def _cycle_anchor(year: int, month: int, billing_day: int) -> datetime:
+    """Midnight on the billing day of the given month (clamped to the month's last day)."""
+    import calendar
+    return datetime(year, month, min(billing_day, calendar.monthrange(year, month)[1]))
 
 
 def get_billing_cycle(now: datetime, billing_day: int) -> tuple[datetime, datetime]:
     """Return billing cycle start/end based on the billing day."""
-    if now.day >= billing_day:
-        billing_start = now.replace(day=billing_day, hour=0, minute=0, second=0, microsecond=0)
-    else:
-        if now.month == 1:
-            billing_start = datetime(now.year - 1, 12, billing_day, 0, 0, 0)
-        else:
-            billing_start = datetime(now.year, now.month - 1, billing_day, 0, 0, 0)
-
-    if billing_start.month == 12:
-        billing_end = datetime(billing_start.year + 1, 1, billing_day, 0, 0, 0)
-    else:
-        billing_end = datetime(billing_start.year, billing_start.month + 1, billing_day, 0, 0, 0)
-
+    # Month index since year 0, so stepping back/forward a month never needs a Dec/Jan branch
+    month_index = now.year * 12 + now.month - 1
+    if now < _cycle_anchor(now.year, now.month, billing_day):
+        month_index -= 1
+
+    start_year, start_month = divmod(month_index, 12)
+    end_year, end_month = divmod(month_index + 1, 12)
+    billing_start = _cycle_anchor(start_year, start_month + 1, billing_day)
+    billing_end = _cycle_anchor(end_year, end_month + 1, billing_day)
     return billing_start, billing_end
 
 
-def get_cycle_usage(db: sqlite3.Connection, billing_day: int):
-    """Fetch usage rows and metadata for the current billing cycle."""
+def get_cycle_bounds(billing_day: int) -> tuple[datetime, datetime, datetime]:
+    """Return (now, billing_start, billing_end) for the current billing cycle."""
     now = datetime.now()
     billing_start, billing_end = get_billing_cycle(now, billing_day)
+    return now, billing_start, billing_end
 
-    rows = db.execute("""
-        SELECT * FROM usage_events
-        WHERE timestamp >= ? AND timestamp < ?
-        ORDER BY timestamp DESC
-    """, [billing_start.isoformat(), billing_end.isoformat()]).fetchall()
-
-    return now, billing_start, billing_end, rows
-
-
-def summarize_rows(rows):
-    """Summarize usage rows by kind: only On-Demand counts toward quota; Included is shown in parens."""
-    total_cost = sum(float(r['cost']) for r in rows)
-    total_requests = len(rows)
-    total_tokens = sum(int(r['total_tokens']) for r in rows)
-    model_stats = defaultdict(lambda: {'cost': 0, 'count': 0, 'tokens': 0, 'included_cost': 0, 'on_demand_cost': 0})
 
-    billable_cost = 0
-    included_cost = 0
-
-    for r in rows:
-        cost = float(r['cost'])
-        tokens = int(r['total_tokens'])
-        model = r['model']
-        kind = (r['kind'] or "").strip()
-
-        model_stats[model]['cost'] += cost
-        model_stats[model]['count'] += 1
-        model_stats[model]['tokens'] += tokens
-        if kind == KIND_ON_DEMAND:
-            model_stats[model]['on_demand_cost'] += cost
-            billable_cost += cost
-        elif kind == KIND_INCLUDED:
-            model_stats[model]['included_cost'] += cost
-            included_cost += cost
-
-    return total_cost, total_requests, model_stats, billable_cost, included_cost, total_tokens
+def cycle_aggregates(db: sqlite3.Connection, start: datetime, end: datetime, by_model: bool = False):
+    """Aggregate usage in [start, end) inside SQLite.
 
+    Only On-Demand counts toward quota; Included is tracked separately.
+    Returns (total_cost, total_requests, model_stats, billable_cost, included_cost, total_tokens);
+    model_stats is only filled in when by_model is set, ordered by cost (highest first).
+    """
+    params = [KIND_ON_DEMAND, KIND_INCLUDED, to_epoch(start), to_epoch(end)]
+
+    row = db.execute("""
+        SELECT
+            COALESCE(SUM(cost), 0) as total_cost,
+            COUNT(*) as total_requests,
+            COALESCE(SUM(total_tokens), 0) as total_tokens,
+            COALESCE(SUM(CASE WHEN TRIM(kind) = ? THEN cost ELSE 0 END), 0) as billable_cost,
+            COALESCE(SUM(CASE WHEN TRIM(kind) = ? THEN cost ELSE 0 END), 0) as included_cost
+        FROM usage_events
+        WHERE ts_epoch >= ? AND ts_epoch < ?
+    """, params).fetchone()
 
-def quota_check(billing_day: int = DEFAULT_BILLING_DAY, json_output: bool = False, output_path: str = None, on_demand_reported: float = None):
+    model_stats = {}
+    if by_model:
+        for r in db.execute("""
+            SELECT
+                model,
+                SUM(cost) as cost,
+                COUNT(*) as count,
+                SUM(total_tokens) as tokens,
+                SUM(CASE WHEN TRIM(kind) = ? THEN cost ELSE 0 END) as on_demand_cost,
+                SUM(CASE WHEN TRIM(kind) = ? THEN cost ELSE 0 END) as included_cost
+            FROM usage_events
+            WHERE ts_epoch >= ? AND ts_epoch < ?
+            GROUP BY model
+            ORDER BY cost DESC, model
+        """, params):
+            model_stats[r['model']] = dict(r)
+
+    return (
+        row['total_cost'], row['total_requests'], model_stats,
+        row['billable_cost'], row['included_cost'], row['total_tokens'],
+    )
+
+
+def quota_check(db: sqlite3.Connection, billing_day: int = DEFAULT_BILLING_DAY, json_output: bool = False, output_path: str = None, on_demand_reported: float = None):
     """Check quota usage against Pro+ plan limits.
 
     Args:
+        db: Open usage database connection
         billing_day: Day of month when billing cycle resets (default: 14)
         json_output: Print JSON to stdout
         output_path: Write JSON to a file (prints path only)
         on_demand_reported: On-demand $ from Cursor console (overrides CSV-derived value; console is authoritative)
     """
-    db = get_db()
-    now, billing_start, billing_end, rows = get_cycle_usage(db, billing_day)
+    now, billing_start, billing_end = get_cycle_bounds(billing_day)
 
     # Plan limits (Pro+ with $100 on-demand)
     pro_plus_base = 70.00
     pro_plus_on_demand = 100.00
     total_quota = pro_plus_base + pro_plus_on_demand
 
-    total_cost, total_requests, model_stats, billable_cost, included_cost, total_tokens = summarize_rows(rows)
+    total_cost, total_requests, model_stats, billable_cost, included_cost, total_tokens = cycle_aggregates(
+        db, billing_start, billing_end, by_model=True
+    )
     days_used = (now - billing_start).days + 1
     days_remaining = (billing_end - now).days
 
@@ -406,6 +593,27 @@ def quota_check(billing_day: int = DEFAULT_BILLING_DAY, json_output: bool = Fals
     if on_demand_reported is not None:
         pct_used = ((pro_plus_base + on_demand_used) / total_quota * 100) if total_quota > 0 else 0
 
+    # model_stats arrives sorted by cost: build the JSON entries and table rows in one pass
+    models = []
+    model_rows = []
+    for model, stats in model_stats.items():
+        pct = (stats['cost'] / total_cost * 100) if total_cost > 0 else 0
+        models.append({
+            "model": model,
+            "cost": round(stats["cost"], 2),
+            "count": stats["count"],
+            "pct": round(pct, 1),
+            "included_cost": round(stats["included_cost"], 2),
+            "on_demand_cost": round(stats["on_demand_cost"], 2),
+        })
+        if stats['on_demand_cost'] == 0:
+            type_label = "Included"
+        elif stats['included_cost'] == 0:
+            type_label = "On-Demand"
+        else:
+            type_label = "Both"
+        model_rows.append(f"{model:<40} | ${stats['cost']:>6.2f} | {stats['count']:>6} | {pct:>4.1f}% | {type_label:>8}")
+
     data = {
         "plan": {
             "name": "Pro+",
@@ -431,29 +639,20 @@ def quota_check(billing_day: int = DEFAULT_BILLING_DAY, json_output: bool = Fals
             "daily_avg": round(daily_avg_billable, 2),
             "projected_cycle": round(projected_cycle, 2),
         },
-        "models": [
-            {
-                "model": model,
-                "cost": round(stats["cost"], 2),
-                "count": stats["count"],
-                "pct": round((stats["cost"] / total_cost * 100) if total_cost > 0 else 0, 1),
-                "included_cost": round(stats["included_cost"], 2),
-                "on_demand_cost": round(stats["on_demand_cost"], 2),
-            }
-            for model, stats in sorted(model_stats.items(), key=lambda x: -x[1]["cost"])
-        ],
+        "models": models,
     }
 
+    if output_path or json_output:
+        import json
+
     if output_path:
         with open(output_path, "w") as f:
             json.dump(data, f, indent=2)
         print(f"Wrote quota JSON to {output_path}")
-        db.close()
         return
 
     if json_output:
         print(json.dumps(data, indent=2))
-        db.close()
         return
 
     print("=" * 70)
@@ -529,15 +728,7 @@ def quota_check(billing_day: int = DEFAULT_BILLING_DAY, json_output: bool = Fals
 
     print(f"{'Model':<40} | {'Cost':>8} | {'Calls':>6} | {'%':>5} | {'Type':>8}")
     print(f"{'─' * 70}")
-    for model, stats in sorted(model_stats.items(), key=lambda x: -x[1]['cost']):
-        pct = (stats['cost'] / total_cost * 100) if total_cost > 0 else 0
-        if stats['on_demand_cost'] == 0:
-            type_label = "Included"
-        elif stats['included_cost'] == 0:
-            type_label = "On-Demand"
-        else:
-            type_label = "Both"
-        print(f"{model:<40} | ${stats['cost']:>6.2f} | {stats['count']:>6} | {pct:>4.1f}% | {type_label:>8}")
+    write_lines(model_rows)
 
     # Token usage summary
     print(f"\n{'─' * 70}")
@@ -546,9 +737,11 @@ def quota_check(billing_day: int = DEFAULT_BILLING_DAY, json_output: bool = Fals
     print(f"{'Model':<40} | {'Tokens':>12} | {'%':>6}")
     print(f"{'─' * 70}")
 
+    token_rows = []
     for model, stats in sorted(model_stats.items(), key=lambda x: -x[1]['tokens']):
         pct = (stats['tokens'] / total_tokens * 100) if total_tokens > 0 else 0
-        print(f"{model:<40} | {format_tokens(stats['tokens']):>12} | {pct:>5.1f}%")
+        token_rows.append(f"{model:<40} | {format_tokens(stats['tokens']):>12} | {pct:>5.1f}%")
+    write_lines(token_rows)
 
     print(f"{'─' * 70}")
     print(f"{'TOTAL':<40} | {format_tokens(total_tokens):>12} |")
@@ -563,14 +756,11 @@ def quota_check(billing_day: int = DEFAULT_BILLING_DAY, json_output: bool = Fals
     if on_demand_reported is None:
         print("• To compare with Cursor web: quota --on-demand-reported <amount from console>")
 
-    db.close()
 
-
-def budget_check(limit: float = 170.0, billing_day: int = DEFAULT_BILLING_DAY, json_output: bool = False, output_path: str = None):
+def budget_check(db: sqlite3.Connection, limit: float = 170.0, billing_day: int = DEFAULT_BILLING_DAY, json_output: bool = False, output_path: str = None):
     """Calculate daily budget for the remainder of the cycle (On-Demand only)."""
-    db = get_db()
-    now, billing_start, billing_end, rows = get_cycle_usage(db, billing_day)
-    total_cost, _, _, billable_cost, included_cost, _ = summarize_rows(rows)
+    now, billing_start, billing_end = get_cycle_bounds(billing_day)
+    total_cost, _, _, billable_cost, included_cost, _ = cycle_aggregates(db, billing_start, billing_end)
 
     days_remaining = (billing_end - now).days
     remaining = max(0, limit - billable_cost)
@@ -590,16 +780,17 @@ def budget_check(limit: float = 170.0, billing_day: int = DEFAULT_BILLING_DAY, j
         },
     }
 
+    if output_path or json_output:
+        import json
+
     if output_path:
         with open(output_path, "w") as f:
             json.dump(data, f, indent=2)
         print(f"Wrote budget JSON to {output_path}")
-        db.close()
         return
 
     if json_output:
         print(json.dumps(data, indent=2))
-        db.close()
         return
 
     print("=" * 70)
@@ -615,10 +806,9 @@ def budget_check(limit: float = 170.0, billing_day: int = DEFAULT_BILLING_DAY, j
     print(f"Days remaining:    {days_remaining}")
     print(f"Safe daily budget: ${daily_budget:.2f}")
 
-    db.close()
-
 
 def alerts_check(
+    db: sqlite3.Connection,
     limit: float = 170.0,
     warn: float = 80.0,
     fail: float = 100.0,
@@ -627,9 +817,8 @@ def alerts_check(
     output_path: str = None,
 ):
     """Return non-zero exit code if usage crosses thresholds (On-Demand only)."""
-    db = get_db()
-    now, billing_start, billing_end, rows = get_cycle_usage(db, billing_day)
-    total_cost, _, _, billable_cost, included_cost, _ = summarize_rows(rows)
+    now, billing_start, billing_end = get_cycle_bounds(billing_day)
+    total_cost, _, _, billable_cost, included_cost, _ = cycle_aggregates(db, billing_start, billing_end)
     pct_used = (billable_cost / limit * 100) if limit > 0 else 0
 
     if pct_used >= fail:
@@ -657,49 +846,59 @@ def alerts_check(
         },
     }
 
+    if output_path or json_output:
+        import json
+
     if output_path:
         with open(output_path, "w") as f:
             json.dump(data, f, indent=2)
         print(f"Wrote alerts JSON to {output_path}")
-        db.close()
         return exit_code
 
     if json_output:
         print(json.dumps(data, indent=2))
-        db.close()
         return exit_code
 
     print(f"Status: {status.upper()} ({pct_used:.1f}% On-Demand used of ${limit:.2f})")
-    db.close()
     return exit_code
 
 
-def export_all():
+def export_all(db: sqlite3.Connection):
     """Export all data to a CSV file."""
-    db = get_db()
+    import csv
 
     output_path = USAGE_DIR / f"export_{datetime.now().strftime('%Y-%m-%d')}.csv"
 
-    rows = db.execute("""
+    # Stream plain tuples in fetchmany() blocks rather than materializing the whole table
+    cur = db.cursor()
+    cur.row_factory = None
+    cur.arraysize = 1024
+    cur.execute("""
         SELECT timestamp, kind, model, max_mode,
                input_cache_write, input_no_cache, cache_read,
                output_tokens, total_tokens, cost
         FROM usage_events
         ORDER BY timestamp DESC
-    """).fetchall()
+    """)
 
-    with open(output_path, 'w', newline='') as f:
+    exported = 0
+    with open(output_path, 'w', newline='', buffering=1 << 20) as f:
         writer = csv.writer(f)
-        writer.writerow([
-            'Date', 'Kind', 'Model', 'Max Mode',
-            'Input (w/ Cache Write)', 'Input (w/o Cache Write)', 'Cache Read',
-            'Output Tokens', 'Total Tokens', 'Cost'
-        ])
-        for row in rows:
-            writer.writerow(list(row))
+        writer.writerow(CSV_COLUMNS)
+        while True:
+            batch = cur.fetchmany()
+            if not batch:
+                break
+            writer.writerows(batch)
+            exported += len(batch)
 
-    print(f"Exported {len(rows)} records to {output_path}")
-    db.close()
+    print(f"Exported {exported} records to {output_path}")
+
+
+def write_reminder_stamp(today: date) -> None:
+    """Record that the reminder ran today (for --once)."""
+    USAGE_DIR.mkdir(exist_ok=True)
+    REMINDER_STATE_PATH.write_text(today.isoformat())
 
 
 def reminder_check(
@@ -723,22 +922,28 @@ def reminder_check(
             return
 
     yesterday = today - timedelta(days=1)
-    pattern = re.compile(r"usage-events-(\d{4}-\d{2}-\d{2})")
     csv_dates = set()
 
-    for csv_path in USAGE_DIR.glob("usage-events-*.csv"):
-        match = pattern.search(csv_path.name)
-        if match:
-            try:
-                csv_dates.add(datetime.strptime(match.group(1), "%Y-%m-%d").date())
-            except ValueError:
-                continue
+    # usage-events-YYYY-MM-DD*.csv: the date is always the 10 chars after the prefix
+    prefix_len = len(USAGE_CSV_PREFIX)
+    try:
+        with os.scandir(USAGE_DIR) as entries:
+            for entry in entries:
+                name = entry.name
+                if not (name.startswith(USAGE_CSV_PREFIX) and name.endswith(".csv")):
+                    continue
+                try:
+                    csv_dates.add(date.fromisoformat(name[prefix_len:prefix_len + 10]))
+                except ValueError:
+                    continue
+    except FileNotFoundError:
+        pass  # No cursor-usage/ yet: same as no exports
 
     if not csv_dates:
         print("No CSV exports found in cursor-usage/.")
         print(f"Please export yesterday's usage CSV: {yesterday.strftime(DATE_FMT_DISPLAY)}")
         if once_per_day and not no_stamp:
-            REMINDER_STATE_PATH.write_text(today.isoformat())
+            write_reminder_stamp(today)
         return
 
     latest_date = max(csv_dates)
@@ -749,7 +954,7 @@ def reminder_check(
         print(f"Latest CSV date: {latest_date.strftime(DATE_FMT_DISPLAY)}")
         print("Please export yesterday's usage CSV from Cursor.")
     if once_per_day and not no_stamp:
-        REMINDER_STATE_PATH.write_text(today.isoformat())
+        write_reminder_stamp(today)
 
 
 def main():
@@ -759,6 +964,8 @@ def main():
     # Import command
     import_parser = subparsers.add_parser('import', help='Import CSV files')
     import_parser.add_argument('file', nargs='?', help='Specific CSV file to import')
+    import_parser.add_argument('--fast', action='store_true',
+                               help='Bulk-load via the sqlite3 CLI (falls back if not installed)')
 
     # Report command
     report_parser = subparsers.add_parser('report', help='Generate usage report')
@@ -810,37 +1017,46 @@ def main():
 
     args = parser.parse_args()
 
-    # Ensure usage directory exists
-    USAGE_DIR.mkdir(exist_ok=True)
-
-    if args.command == 'import':
-        import_all(args.file)
-    elif args.command == 'report':
-        report_summary(args.days)
-        if args.model:
-            report_by_model(args.days)
-        if args.daily:
-            report_daily(args.days or 30)
-        if args.weekly:
-            report_weekly()
-        if not args.model and not args.daily and not args.weekly:
-            # Default: show model breakdown
-            report_by_model(args.days)
-    elif args.command == 'quota':
-        quota_check(args.billing_day, args.json, args.out, getattr(args, 'on_demand_reported', None))
-    elif args.command == 'budget':
-        budget_check(args.limit, args.billing_day, args.json, args.out)
-    elif args.command == 'alerts':
-        exit_code = alerts_check(
-            args.limit, args.warn, args.fail, args.billing_day, args.json, args.out
-        )
-        sys.exit(exit_code)
-    elif args.command == 'reminder':
+    if args.command == 'reminder':
         reminder_check(args.once, args.date, args.no_stamp)
-    elif args.command == 'export':
-        export_all()
-    else:
+        return
+    if args.command is None:
         parser.print_help()
+        return
+
+    # One connection for the whole invocation
+    db = get_db()
+    try:
+        if args.command == 'import':
+            import_all(db, args.file, args.fast)
+        elif args.command == 'report':
+            # All sections share one --days window and one read snapshot
+            source = usage_window(db, args.days)
+            db.execute("BEGIN")
+            report_summary(db, args.days, source)
+            if args.model:
+                report_by_model(db, args.days, source)
+            if args.daily:
+                report_daily(db, args.days or 30)
+            if args.weekly:
+                report_weekly(db)
+            if not args.model and not args.daily and not args.weekly:
+                # Default: show model breakdown
+                report_by_model(db, args.days, source)
+            db.commit()
+        elif args.command == 'quota':
+            quota_check(db, args.billing_day, args.json, args.out, getattr(args, 'on_demand_reported', None))
+        elif args.command == 'budget':
+            budget_check(db, args.limit, args.billing_day, args.json, args.out)
+        elif args.command == 'alerts':
+            exit_code = alerts_check(
+                db, args.limit, args.warn, args.fail, args.billing_day, args.json, args.out
+            )
+            sys.exit(exit_code)
+        elif args.command == 'export':
+            export_all(db)
+    finally:
+        close_db()
 
 
 if __name__ == "__main__":
@@ -23,91 +23,396 @@ Usage:
 Categories: dev, concept, tool, workflow, debug, general (customize as needed)
 """
 
-import argparse
 import json
-import random
+import os
+import re
+import sqlite3
 import sys
-from datetime import datetime, timedelta
+import time
+from datetime import date, datetime
+from itertools import groupby
+from operator import itemgetter
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
 # Data file location
 DATA_DIR = Path(__file__).parent.parent / "cursor-data"
-FLASHCARDS_FILE = DATA_DIR / "flashcards.json"
+FLASHCARDS_DB = DATA_DIR / "flashcards.db"
+FLASHCARDS_FILE = DATA_DIR / "flashcards.json"  # Legacy deck, migrated into FLASHCARDS_DB once
 QUIZ_STATE_FILE = DATA_DIR / ".quiz_state.json"
 
 # Categories for organizing cards (customize for your domain)
-CATEGORIES = ["dev", "concept", "tool", "workflow", "debug", "general"]
+CATEGORIES = ("dev", "concept", "tool", "workflow", "debug", "general")
+_CATSET = frozenset(CATEGORIES)  # Membership checks; CATEGORIES keeps display order
 
 # SM-2 Algorithm defaults
 DEFAULT_EASE = 2.5
 MIN_EASE = 1.3
 
+CARD_COLUMNS = (
+    "id", "question", "answer", "category", "tags", "source",
+    "created", "last_review", "next_review",
+    "ease_factor", "interval", "repetitions", "total_reviews",
+)
+INSERT_CARD_SQL = f"INSERT INTO cards ({', '.join(CARD_COLUMNS)}) VALUES ({', '.join('?' * len(CARD_COLUMNS))})"
 
-def load_cards() -> dict:
-    """Load flashcards from JSON file."""
-    if not FLASHCARDS_FILE.exists():
-        return {"cards": [], "stats": {"total_reviews": 0, "streak_days": 0, "last_review_date": None}}
-    
-    with open(FLASHCARDS_FILE, "r") as f:
-        return json.load(f)
+# One alternation classifies each markdown-import line; match.lastgroup names the kind
+IMPORT_LINE_RE = re.compile(
+    r"## (?P<category>.*)"
+    r"|### Q ?:(?P<question>.*)"
+    r"|\*\*A ?:\*\*(?P<answer>.*)"
+    r"|\*Tags:(?P<tags>.*)"
+    r"|\*Source:(?P<source>.*)"
+)
+
+
+def _to_ts(iso: Optional[str]) -> Optional[int]:
+    """ISO timestamp (legacy JSON deck) -> epoch seconds (None passes through)."""
+    return int(datetime.fromisoformat(iso).timestamp()) if iso else None
+
+
+def format_ts(ts: int, fmt: str = "%Y-%m-%d") -> str:
+    """Format an epoch-seconds card timestamp in local time."""
+    return datetime.fromtimestamp(ts).strftime(fmt)
+
+
+def _row_to_card(row: sqlite3.Row) -> dict:
+    """Convert a cards row into a card dict (epoch-second timestamps, tag list)."""
+    card = dict(row)
+    card["tags"] = json.loads(card["tags"]) if card["tags"] else []
+    return card
+
+
+def _card_params(card: dict) -> tuple:
+    """Convert a card dict into INSERT_CARD_SQL parameters."""
+    row = dict(card, tags=json.dumps(card.get("tags") or []))
+    return tuple(row.get(col) for col in CARD_COLUMNS)
 
 
-def save_cards(data: dict):
-    """Save flashcards to JSON file."""
+def get_db() -> sqlite3.Connection:
+    """Open the flashcard database, creating tables (and migrating flashcards.json) if needed."""
     DATA_DIR.mkdir(exist_ok=True)
-    with open(FLASHCARDS_FILE, "w") as f:
-        json.dump(data, f, indent=2, default=str)
+    db = sqlite3.connect(FLASHCARDS_DB)
+    db.row_factory = sqlite3.Row
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")
+    db.execute("""
+        CREATE TABLE IF NOT EXISTS cards (
+            id TEXT PRIMARY KEY,
+            question TEXT,
+            answer TEXT,
+            category TEXT,
+            tags TEXT,
+            source TEXT,
+            created INTEGER,
+            last_review INTEGER,
+            next_review INTEGER,
+            ease_factor REAL,
+            interval INTEGER,
+            repetitions INTEGER,
+            total_reviews INTEGER
+        )
+    """)
+    db.execute("CREATE INDEX IF NOT EXISTS idx_next ON cards(next_review)")
+    db.execute("""
+        CREATE TABLE IF NOT EXISTS stats (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            total_reviews INTEGER,
+            streak_days INTEGER,
+            last_review_date INTEGER
+        )
+    """)
+    if db.execute("SELECT 1 FROM stats").fetchone() is None:
+        # New database: seed stats and pull in a pre-SQLite flashcards.json, if any
+        db.execute("INSERT INTO stats (id, total_reviews, streak_days, last_review_date) VALUES (1, 0, 0, NULL)")
+        if FLASHCARDS_FILE.exists():
+            with open(FLASHCARDS_FILE, "r") as f:
+                legacy = json.load(f)
+            seen = set()
+            rows = []
+            for card in legacy.get("cards", []):
+                card = dict(card, **{key: _to_ts(card.get(key)) for key in ("created", "last_review", "next_review")})
+                # Older second-resolution IDs could collide; keep both cards
+                while card["id"] in seen:
+                    card["id"] = generate_id()
+                seen.add(card["id"])
+                rows.append(_card_params(card))
+            db.executemany(INSERT_CARD_SQL, rows)
+            stats = legacy.get("stats") or {}
+            last_date = stats.get("last_review_date")
+            db.execute(
+                "UPDATE stats SET total_reviews = ?, streak_days = ?, last_review_date = ? WHERE id = 1",
+                (
+                    stats.get("total_reviews", 0),
+                    stats.get("streak_days", 0),
+                    date.fromisoformat(last_date).toordinal() if last_date else None,
+                ),
+            )
+    db.commit()
+    return db
 
 
 def generate_id() -> str:
-    """Generate a unique card ID."""
-    return datetime.now().strftime("%Y%m%d%H%M%S") + str(random.randint(100, 999))
+    """Generate a unique card ID: 48-bit millisecond timestamp + 80 random bits, hex (sorts by creation)."""
+    return f"{time.time_ns() // 1_000_000:012x}{os.urandom(10).hex()}"
 
 
-def add_card(question: str, answer: str, category: str = "general", tags: list = None, source: str = None) -> dict:
-    """Add a new flashcard."""
-    data = load_cards()
-    
-    card = {
+def sm2_update(quality: int, repetitions: int, interval: int, ease_factor: float) -> tuple:
+    """One SM-2 step: return the new (repetitions, interval, ease_factor) for a review of this quality."""
+    if quality < 3:
+        # Failed - reset repetitions
+        repetitions = 0
+        interval = 1
+    else:
+        # Passed
+        if repetitions == 0:
+            interval = 1
+        elif repetitions == 1:
+            interval = 6
+        else:
+            interval = round(interval * ease_factor)
+
+        repetitions += 1
+
+    # Update ease factor
+    ease_factor = max(
+        MIN_EASE,
+        ease_factor + (0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+    )
+    return repetitions, interval, ease_factor
+
+
+def _build_card(question: str, answer: str, category: str = "general", tags: list = None, source: str = None) -> dict:
+    """Build a new, immediately-due card dict without touching the database."""
+    now = int(time.time())
+    return {
         "id": generate_id(),
         "question": question,
         "answer": answer,
         "category": category,
         "tags": tags or [],
         "source": source,  # File path or URL this card relates to
-        "created": datetime.now().isoformat(),
+        "created": now,
         "last_review": None,
-        "next_review": datetime.now().isoformat(),  # Due immediately
+        "next_review": now,  # Due immediately
         "ease_factor": DEFAULT_EASE,
         "interval": 0,  # Days until next review
         "repetitions": 0,
         "total_reviews": 0
     }
-    
-    data["cards"].append(card)
-    save_cards(data)
-    return card
+
+
+_ACTIVE_STORE = None
+
+
+class CardStore:
+    """
+    One database connection for a whole CLI invocation.
+
+    Changes are committed once on a clean exit and rolled back on error.
+    A CardStore opened while another is active reuses its connection, so
+    helpers that open their own store share the caller's transaction.
+    """
+
+    def __init__(self):
+        self.db = None
+        self._outer = None
+
+    def __enter__(self) -> "CardStore":
+        global _ACTIVE_STORE
+        self._outer = _ACTIVE_STORE
+        self.db = self._outer.db if self._outer else get_db()
+        _ACTIVE_STORE = self
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        global _ACTIVE_STORE
+        _ACTIVE_STORE = self._outer
+        if self._outer is None:
+            if exc_type is None:
+                self.db.commit()
+            else:
+                self.db.rollback()
+            self.db.close()
+        return False
+
+    def _stats_row(self) -> dict:
+        """Global review stats (total_reviews, streak_days, last_review_date as a date ordinal)."""
+        row = self.db.execute("SELECT total_reviews, streak_days, last_review_date FROM stats WHERE id = 1").fetchone()
+        return dict(row)
+
+    def load(self) -> dict:
+        """The whole deck as {"cards": [...], "stats": {...}}."""
+        cards = [_row_to_card(r) for r in self.db.execute("SELECT * FROM cards ORDER BY rowid")]
+        return {"cards": cards, "stats": self._stats_row()}
+
+    def add(self, question: str, answer: str, category: str = "general", tags: list = None, source: str = None) -> dict:
+        """Insert a new card and return it."""
+        card = _build_card(question, answer, category, tags, source)
+        self.db.execute(INSERT_CARD_SQL, _card_params(card))
+        return card
+
+    def add_many(self, entries: list) -> int:
+        """Insert (question, answer, category, tags, source) tuples with one executemany."""
+        rows = [_card_params(_build_card(*entry)) for entry in entries]
+        self.db.executemany(INSERT_CARD_SQL, rows)
+        return len(rows)
+
+    def due(self, limit: int = None) -> list:
+        """Cards due for review, oldest first."""
+        rows = self.db.execute(
+            "SELECT * FROM cards WHERE next_review <= ? ORDER BY next_review, rowid LIMIT ?",
+            (int(time.time()), limit or -1),
+        )
+        return [_row_to_card(r) for r in rows]
+
+    def review(self, card_id: str, quality: int) -> dict:
+        """Apply one SM-2 review (see review_card) and return the updated card."""
+        row = self.db.execute("SELECT * FROM cards WHERE id = ?", (card_id,)).fetchone()
+        if not row:
+            raise ValueError(f"Card not found: {card_id}")
+        card = _row_to_card(row)
+
+        card["repetitions"], card["interval"], card["ease_factor"] = sm2_update(
+            quality, card["repetitions"], card["interval"], card["ease_factor"]
+        )
+
+        # Update review timestamps
+        now = int(time.time())
+        card["last_review"] = now
+        card["next_review"] = now + card["interval"] * 86400
+        card["total_reviews"] += 1
+
+        self.db.execute("""
+            UPDATE cards
+            SET repetitions = ?, interval = ?, ease_factor = ?,
+                last_review = ?, next_review = ?, total_reviews = ?
+            WHERE id = ?
+        """, (
+            card["repetitions"], card["interval"], card["ease_factor"],
+            card["last_review"], card["next_review"], card["total_reviews"],
+            card_id,
+        ))
+
+        # Update global stats
+        stats = self._stats_row()
+        today = date.fromtimestamp(now).toordinal()
+
+        if stats["last_review_date"] == today:
+            pass  # Same day, streak continues
+        elif stats["last_review_date"] == today - 1:
+            stats["streak_days"] += 1
+        else:
+            stats["streak_days"] = 1
+
+        self.db.execute(
+            "UPDATE stats SET total_reviews = total_reviews + 1, streak_days = ?, last_review_date = ? WHERE id = 1",
+            (stats["streak_days"], today),
+        )
+        return card
+
+    def random(self, category: str = None, from_files: list = None) -> Optional[dict]:
+        """A random card, optionally filtered by category or source files."""
+        where, params = [], []
+        if category:
+            where.append("category = ?")
+            params.append(category)
+
+        card = None
+        if from_files:
+            # Every entry matches anywhere in the source (git log passes literal paths such
+            # as "app/[id]/page.tsx"); pattern-looking entries may also match as a whole-source GLOB
+            matches, file_params = [], []
+            for f in from_files:
+                if any(ch in f for ch in "*?["):
+                    matches.append("(instr(source, ?) > 0 OR source GLOB ?)")
+                    file_params += [f, f]
+                else:
+                    matches.append("instr(source, ?) > 0")
+                    file_params.append(f)
+            card = self._pick_one(where + ["(" + " OR ".join(matches) + ")"], params + file_params)
+        return card or self._pick_one(where, params)
+
+    def _pick_one(self, where: list, params: list) -> Optional[dict]:
+        """One random card matching all of the given WHERE clauses, or None."""
+        sql = "SELECT * FROM cards"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        # SQLite keeps a single best row for ORDER BY ... LIMIT 1 rather than sorting every match
+        row = self.db.execute(sql + " ORDER BY RANDOM() LIMIT 1", params).fetchone()
+        return _row_to_card(row) if row else None
+
+    def sample(self, n: int = 5) -> list:
+        """n random cards from the full deck."""
+        rows = self.db.execute("SELECT * FROM cards ORDER BY RANDOM() LIMIT ?", (n,))
+        return [_row_to_card(r) for r in rows]
+
+    def stats(self) -> dict:
+        """Review statistics (see get_stats), from one pass over the cards table."""
+        total = due_count = mastered = learning = new = 0
+        by_category = dict.fromkeys(CATEGORIES, 0)
+        rows = self.db.execute("""
+            SELECT
+                category,
+                COUNT(*),
+                SUM(next_review <= ?),
+                SUM(interval >= 21),
+                SUM(interval > 0 AND interval < 21),
+                SUM(interval = 0)
+            FROM cards
+            GROUP BY category
+        """, (int(time.time()),))
+        for cat, count, due, mast, learn, fresh in rows:
+            total += count
+            due_count += due
+            mastered += mast  # 3+ weeks
+            learning += learn
+            new += fresh
+            if cat in by_category:
+                by_category[cat] = count
+
+        stats = self._stats_row()
+
+        return {
+            "total_cards": total,
+            "due_today": due_count,
+            "mastered": mastered,
+            "learning": learning,
+            "new": new,
+            "total_reviews": stats["total_reviews"],
+            "streak_days": stats["streak_days"],
+            "by_category": by_category
+        }
+
+    def cards(self, category: str = None) -> list:
+        """All cards in insertion order, optionally filtered by category."""
+        if category:
+            rows = self.db.execute("SELECT * FROM cards WHERE category = ? ORDER BY rowid", (category,))
+        else:
+            rows = self.db.execute("SELECT * FROM cards ORDER BY rowid")
+        return [_row_to_card(r) for r in rows]
+
+    def delete(self, card_id: str) -> bool:
+        """Delete a card by ID; True if it existed."""
+        return self.db.execute("DELETE FROM cards WHERE id = ?", (card_id,)).rowcount > 0
+
+
+def load_cards() -> dict:
+    """Load the whole deck as {"cards": [...], "stats": {...}}."""
+    with CardStore() as store:
+        return store.load()
+
+
+def add_card(question: str, answer: str, category: str = "general", tags: list = None, source: str = None) -> dict:
+    """Add a new flashcard."""
+    with CardStore() as store:
+        return store.add(question, answer, category, tags, source)
 
 
 def get_due_cards(limit: int = None) -> list:
-    """Get cards due for review."""
-    data = load_cards()
-    now = datetime.now()
-    
-    due = []
-    for card in data["cards"]:
-        next_review = datetime.fromisoformat(card["next_review"])
-        if next_review <= now:
-            due.append(card)
-    
-    # Sort by next_review (oldest first)
-    due.sort(key=lambda c: c["next_review"])
-    
-    if limit:
-        due = due[:limit]
-    
-    return due
+    """Get cards due for review, oldest first."""
+    with CardStore() as store:
+        return store.due(limit)
 
 
 def review_card(card_id: str, quality: int) -> dict:
@@ -122,179 +427,71 @@ def review_card(card_id: str, quality: int) -> dict:
         4 - Correct, with some hesitation
         5 - Perfect response, no hesitation
     """
-    data = load_cards()
-    
-    card = None
-    for c in data["cards"]:
-        if c["id"] == card_id:
-            card = c
-            break
-    
-    if not card:
-        raise ValueError(f"Card not found: {card_id}")
-    
-    # SM-2 Algorithm
-    if quality < 3:
-        # Failed - reset repetitions
-        card["repetitions"] = 0
-        card["interval"] = 1
-    else:
-        # Passed
-        if card["repetitions"] == 0:
-            card["interval"] = 1
-        elif card["repetitions"] == 1:
-            card["interval"] = 6
-        else:
-            card["interval"] = round(card["interval"] * card["ease_factor"])
-        
-        card["repetitions"] += 1
-    
-    # Update ease factor
-    card["ease_factor"] = max(
-        MIN_EASE,
-        card["ease_factor"] + (0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
-    )
-    
-    # Update review timestamps
-    card["last_review"] = datetime.now().isoformat()
-    card["next_review"] = (datetime.now() + timedelta(days=card["interval"])).isoformat()
-    card["total_reviews"] += 1
-    
-    # Update global stats
-    data["stats"]["total_reviews"] += 1
-    today = datetime.now().strftime("%Y-%m-%d")
-    
-    if data["stats"]["last_review_date"] == today:
-        pass  # Same day, streak continues
-    elif data["stats"]["last_review_date"] == (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d"):
-        data["stats"]["streak_days"] += 1
-    else:
-        data["stats"]["streak_days"] = 1
-    
-    data["stats"]["last_review_date"] = today
-    
-    save_cards(data)
-    return card
+    with CardStore() as store:
+        return store.review(card_id, quality)
 
 
 def get_random_card(category: str = None, from_files: list = None) -> Optional[dict]:
     """Get a random card, optionally filtered by category or source files."""
-    data = load_cards()
-    cards = data["cards"]
-    
-    if not cards:
-        return None
-    
-    if category:
-        cards = [c for c in cards if c["category"] == category]
-    
-    if from_files:
-        # Filter cards whose source matches any of the files
-        filtered = []
-        for card in cards:
-            if card.get("source"):
-                for f in from_files:
-                    if f in card["source"]:
-                        filtered.append(card)
-                        break
-        if filtered:
-            cards = filtered
-    
-    if not cards:
-        return None
-    
-    return random.choice(cards)
+    with CardStore() as store:
+        return store.random(category, from_files)
 
 
 def get_random_cards(n: int = 5) -> list:
     """Return n random cards from the full deck (for practice mode)."""
-    data = load_cards()
-    cards = data.get("cards", [])
-    if not cards:
-        return []
-    k = min(n, len(cards))
-    return random.sample(cards, k)
+    with CardStore() as store:
+        return store.sample(n)
 
 
 def get_stats() -> dict:
     """Get review statistics."""
-    data = load_cards()
-    cards = data["cards"]
-    
-    now = datetime.now()
-    due_count = sum(1 for c in cards if datetime.fromisoformat(c["next_review"]) <= now)
-    
-    # Calculate mastery levels
-    mastered = sum(1 for c in cards if c["interval"] >= 21)  # 3+ weeks
-    learning = sum(1 for c in cards if 0 < c["interval"] < 21)
-    new = sum(1 for c in cards if c["interval"] == 0)
-    
-    # Category breakdown
-    by_category = {}
-    for cat in CATEGORIES:
-        by_category[cat] = sum(1 for c in cards if c["category"] == cat)
-    
-    return {
-        "total_cards": len(cards),
-        "due_today": due_count,
-        "mastered": mastered,
-        "learning": learning,
-        "new": new,
-        "total_reviews": data["stats"]["total_reviews"],
-        "streak_days": data["stats"]["streak_days"],
-        "by_category": by_category
-    }
+    with CardStore() as store:
+        return store.stats()
 
 
 def list_cards(category: str = None, show_answers: bool = False) -> list:
     """List all cards, optionally filtered by category."""
-    data = load_cards()
-    cards = data["cards"]
-    
-    if category:
-        cards = [c for c in cards if c["category"] == category]
-    
-    return cards
+    with CardStore() as store:
+        return store.cards(category)
 
 
 def delete_card(card_id: str) -> bool:
     """Delete a card by ID."""
-    data = load_cards()
-    original_len = len(data["cards"])
-    data["cards"] = [c for c in data["cards"] if c["id"] != card_id]
-    
-    if len(data["cards"]) < original_len:
-        save_cards(data)
-        return True
-    return False
+    with CardStore() as store:
+        return store.delete(card_id)
+
+
+def iter_markdown(store: CardStore) -> Iterator[str]:
+    """Yield the markdown export one newline-terminated line at a time."""
+    yield "# Flashcard Export\n"
+    yield "\n"
+    yield f"*Exported: {datetime.now().strftime('%Y-%m-%d %H:%M')}*\n"
+    yield "\n"
+
+    # Cards arrive grouped in CATEGORIES order (creation order within each)
+    placeholders = ", ".join("?" * len(CATEGORIES))
+    rank = " ".join(f"WHEN ? THEN {i}" for i in range(len(CATEGORIES)))
+    rows = store.db.execute(
+        f"SELECT * FROM cards WHERE category IN ({placeholders}) ORDER BY CASE category {rank} END, rowid",
+        CATEGORIES + CATEGORIES,
+    )
+    for cat, cards in groupby(map(_row_to_card, rows), key=itemgetter("category")):
+        yield f"## {cat.upper()}\n"
+        yield "\n"
+        for card in cards:
+            yield f"### Q: {card['question']}\n"
+            yield f"**A:** {card['answer']}\n"
+            if card.get("tags"):
+                yield f"*Tags: {', '.join(card['tags'])}*\n"
+            if card.get("source"):
+                yield f"*Source: {card['source']}*\n"
+            yield "\n"
 
 
 def export_to_markdown() -> str:
     """Export all cards to markdown format."""
-    data = load_cards()
-    lines = ["# Flashcard Export", "", f"*Exported: {datetime.now().strftime('%Y-%m-%d %H:%M')}*", ""]
-    
-    by_category = {}
-    for card in data["cards"]:
-        cat = card["category"]
-        if cat not in by_category:
-            by_category[cat] = []
-        by_category[cat].append(card)
-    
-    for cat in CATEGORIES:
-        if cat in by_category and by_category[cat]:
-            lines.append(f"## {cat.upper()}")
-            lines.append("")
-            for card in by_category[cat]:
-                lines.append(f"### Q: {card['question']}")
-                lines.append(f"**A:** {card['answer']}")
-                if card.get("tags"):
-                    lines.append(f"*Tags: {', '.join(card['tags'])}*")
-                if card.get("source"):
-                    lines.append(f"*Source: {card['source']}*")
-                lines.append("")
-    
-    return "\n".join(lines)
+    with CardStore() as store:
+        return "".join(iter_markdown(store))
 
 
 def import_from_markdown(filepath: str) -> int:
@@ -304,55 +501,60 @@ def import_from_markdown(filepath: str) -> int:
         raise FileNotFoundError(f"File not found: {filepath}")
     
     content = path.read_text()
-    lines = content.split("\n")
     
-    imported = 0
+    parsed = []
     current_category = "general"
+    question_category = current_category  # Category in effect when the current question started
     current_question = None
     current_answer = None
     current_tags = []
     current_source = None
     
-    for line in lines:
-        line = line.strip()
+    for line in content.splitlines():
+        m = IMPORT_LINE_RE.match(line.strip())
+        if not m:
+            continue
+        kind = m.lastgroup
+        value = m.group(kind)
         
         # Category header
-        if line.startswith("## "):
-            cat = line[3:].strip().lower()
-            if cat in CATEGORIES:
+        if kind == "category":
+            cat = value.strip().lower()
+            if cat in _CATSET:
                 current_category = cat
         
         # Question
-        elif line.startswith("### Q:") or line.startswith("### Q :"):
+        elif kind == "question":
             # Save previous card if exists
             if current_question and current_answer:
-                add_card(current_question, current_answer, current_category, current_tags, current_source)
-                imported += 1
+                parsed.append((current_question, current_answer, question_category, current_tags, current_source))
             
-            current_question = line.split(":", 1)[1].strip()
+            current_question = value.strip()
+            question_category = current_category
             current_answer = None
             current_tags = []
             current_source = None
         
         # Answer
-        elif line.startswith("**A:**") or line.startswith("**A :**"):
-            current_answer = line.split(":", 1)[1].strip()
+        elif kind == "answer":
+            current_answer = value.strip()
         
         # Tags
-        elif line.startswith("*Tags:"):
-            tags_str = line[6:].rstrip("*").strip()
+        elif kind == "tags":
+            tags_str = value.rstrip("*").strip()
             current_tags = [t.strip() for t in tags_str.split(",")]
         
         # Source
-        elif line.startswith("*Source:"):
-            current_source = line[8:].rstrip("*").strip()
+        else:
+            current_source = value.rstrip("*").strip()
     
     # Save last card
     if current_question and current_answer:
-        add_card(current_question, current_answer, current_category, current_tags, current_source)
-        imported += 1
-    
-    return imported
+        parsed.append((current_question, current_answer, question_category, current_tags, current_source))
+
+    # One transaction for the whole file
+    with CardStore() as store:
+        return store.add_many(parsed)
 
 
 def format_card_display(card: dict, show_answer: bool = False, show_id: bool = False) -> str:
@@ -374,14 +576,14 @@ def format_card_display(card: dict, show_answer: bool = False, show_id: bool = F
     
     # Show review info
     if card["last_review"]:
-        last = datetime.fromisoformat(card["last_review"]).strftime("%Y-%m-%d")
+        last = format_ts(card["last_review"])
         lines.append(f"   Last: {last} | Interval: {card['interval']}d | Ease: {card['ease_factor']:.2f}")
     
     return "\n".join(lines)
 
 
-def interactive_quiz(cards: list):
-    """Run interactive quiz mode."""
+def interactive_quiz(cards: list, store: CardStore):
+    """Run interactive quiz mode; reviews are written through store."""
     if not cards:
         print("No cards due for review!")
         return
@@ -394,7 +596,11 @@ def interactive_quiz(cards: list):
         print(f"[{i}/{len(cards)}] ({card['category']})")
         print(f"\nQ: {card['question']}\n")
         
-        input("Press Enter to reveal answer...")
+        try:
+            input("Press Enter to reveal answer...")
+        except (KeyboardInterrupt, EOFError):
+            print("\n\nQuiz interrupted.")
+            return
         print(f"\nA: {card['answer']}\n")
         
         print("Rate your recall (0-5):")
@@ -413,17 +619,19 @@ def interactive_quiz(cards: list):
                 print("Please enter 0-5")
             except ValueError:
                 print("Please enter a number 0-5")
-            except KeyboardInterrupt:
+            except (KeyboardInterrupt, EOFError):
                 print("\n\nQuiz interrupted.")
                 return
         
-        updated = review_card(card["id"], quality)
-        next_review = datetime.fromisoformat(updated["next_review"]).strftime("%Y-%m-%d")
+        updated = store.review(card["id"], quality)
+        # Keep each rating, and don't hold the write lock while waiting on input()
+        store.db.commit()
+        next_review = format_ts(updated["next_review"])
         print(f"\nNext review: {next_review}")
         print(f"\n{'-'*50}\n")
     
     print("Quiz complete!")
-    stats = get_stats()
+    stats = store.stats()
     print(f"Streak: {stats['streak_days']} days | Total reviews: {stats['total_reviews']}")
 
 
@@ -436,7 +644,7 @@ def save_quiz_state(state: dict) -> None:
     """Persist quiz state for --answer / --skip."""
     DATA_DIR.mkdir(exist_ok=True)
     with open(QUIZ_STATE_FILE, "w") as f:
-        json.dump(state, f, indent=2, default=str)
+        json.dump(state, f, indent=2)
 
 
 def load_quiz_state() -> Optional[dict]:
@@ -509,7 +717,7 @@ def quiz_answer(user_answer: str) -> str:
     is_practice = state.get("practice", False)
     if not is_practice:
         updated = review_card(card["id"], 4)  # Assume engaged; no grader
-        next_review = datetime.fromisoformat(updated["next_review"]).strftime("%Y-%m-%d")
+        next_review = format_ts(updated["next_review"])
     lines = [
         "",
         "-" * 50,
@@ -603,6 +811,7 @@ def quiz_skip() -> str:
 
 def parse_args():
     """Parse command line arguments."""
+    import argparse
     parser = argparse.ArgumentParser(
         description="Flashcard review system with spaced repetition",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -661,11 +870,34 @@ Examples:
 
 
 def main():
+    if sys.argv[1:] == ["--digest"]:
+        # Shell-prompt fast path: skip building the argparse parser
+        with CardStore() as store:
+            print_digest(store)
+        return
     args = parse_args()
-    
+    with CardStore() as store:
+        run_command(args, store)
+
+
+def print_digest(store: CardStore, as_json: bool = False):
+    """Print the one-line startup digest (due count, streak)."""
+    stats = store.stats()
+    if as_json:
+        print(json.dumps({
+            "due": stats["due_today"],
+            "streak": stats["streak_days"],
+            "total": stats["total_cards"]
+        }))
+    else:
+        print(f"{stats['due_today']} cards due | Streak: {stats['streak_days']} days")
+
+
+def run_command(args, store: CardStore):
+    """Dispatch one CLI action against an open store."""
     # Show cards due today
     if args.today:
-        due = get_due_cards(args.limit)
+        due = store.due(args.limit)
         if args.json:
             print(json.dumps(due, indent=2))
         elif due:
@@ -681,7 +913,7 @@ def main():
     if args.add:
         question, answer = args.add
         tags = args.tags.split(",") if args.tags else []
-        card = add_card(question, answer, args.category or "general", tags, args.source)
+        card = store.add(question, answer, args.category or "general", tags, args.source)
         if args.json:
             print(json.dumps(card, indent=2))
         else:
@@ -694,7 +926,7 @@ def main():
     
     # List all cards
     if args.list:
-        cards = list_cards(args.category)
+        cards = store.cards(args.category)
         if args.json:
             print(json.dumps(cards, indent=2))
         elif cards:
@@ -708,7 +940,7 @@ def main():
     
     # Show statistics
     if args.stats:
-        stats = get_stats()
+        stats = store.stats()
         if args.json:
             print(json.dumps(stats, indent=2))
         else:
@@ -744,15 +976,15 @@ def main():
     
     # Interactive quiz (terminal; uses input())
     if args.quiz:
-        due = get_due_cards()
+        due = store.due()
         if args.category:
             due = [c for c in due if c["category"] == args.category]
-        interactive_quiz(due)
+        interactive_quiz(due, store)
         return
     
     # Random card
     if args.random or args.random_from_files:
-        card = get_random_card(args.category, args.random_from_files)
+        card = store.random(args.category, args.random_from_files)
         if args.json:
             print(json.dumps(card, indent=2))
         elif card:
@@ -765,8 +997,7 @@ def main():
     
     # Export
     if args.export:
-        md = export_to_markdown()
-        print(md)
+        sys.stdout.writelines(iter_markdown(store))
         return
     
     # Import
@@ -781,7 +1012,7 @@ def main():
     
     # Delete card
     if args.delete:
-        if delete_card(args.delete):
+        if store.delete(args.delete):
             print(f"Deleted card {args.delete}")
         else:
             print(f"Card not found: {args.delete}")
@@ -791,8 +1022,8 @@ def main():
     if args.review:
         card_id, quality = args.review
         try:
-            updated = review_card(card_id, int(quality))
-            next_review = datetime.fromisoformat(updated["next_review"]).strftime("%Y-%m-%d")
+            updated = store.review(card_id, int(quality))
+            next_review = format_ts(updated["next_review"])
             print(f"Reviewed card {card_id}")
             print(f"  Next review: {next_review}")
             print(f"  Interval: {updated['interval']} days")
@@ -803,19 +1034,11 @@ def main():
     
     # Digest mode (for startup integration)
     if args.digest:
-        stats = get_stats()
-        if args.json:
-            print(json.dumps({
-                "due": stats["due_today"],
-                "streak": stats["streak_days"],
-                "total": stats["total_cards"]
-            }))
-        else:
-            print(f"{stats['due_today']} cards due | Streak: {stats['streak_days']} days")
+        print_digest(store, args.json)
         return
     
     # Default: show stats summary
-    stats = get_stats()
+    stats = store.stats()
     print(f"\n📚 Flashcards: {stats['total_cards']} total, {stats['due_today']} due")
     print(f"   Streak: {stats['streak_days']} days")
     if stats['due_today'] > 0:
@@ -18,7 +18,6 @@ Usage:
 import argparse
 import json
 import os
-import random
 import subprocess
 import sys
 from datetime import datetime, timedelta
@@ -26,7 +25,7 @@ from pathlib import Path
 
 # Import from sibling modules
 sys.path.insert(0, str(Path(__file__).parent))
-from review import load_cards, get_due_cards, get_stats, get_random_card, review_card
+from review import load_cards, get_due_cards, get_stats, get_random_card, review_card, format_ts
 
 # File to persist the current quiz card between calls
 QUIZ_CACHE_FILE = Path(__file__).parent.parent / "cursor-data" / ".current_quiz.json"
@@ -78,7 +77,7 @@ def save_quiz_card(quiz: dict) -> None:
             json.dump({
                 "quiz": quiz,
                 "timestamp": datetime.now().isoformat()
-            }, f, indent=2, default=str)
+            }, f, indent=2)
     except Exception:
         pass  # Silently fail - not critical
 
@@ -256,6 +255,11 @@ def main():
     
     digest = get_digest()
     
+    # Digest only: skip the quiz (git log, card pick, cache write) on the shell-startup path
+    if args.digest and not (args.json or args.compact or args.reveal):
+        print(format_digest(digest))
+        return
+    
     # Use cache for reveal operations to get the same card that was shown
     use_cache = args.reveal
     quiz = get_quiz_card(use_cache=use_cache)
@@ -267,7 +271,7 @@ def main():
             "quiz": quiz,
             "timestamp": datetime.now().isoformat()
         }
-        print(json.dumps(output, indent=2, default=str))
+        print(json.dumps(output, indent=2))
         return
     
     # Compact output
@@ -281,15 +285,10 @@ def main():
         card = quiz.get("card")
         if card and card.get("id") and not card.get("generated"):
             updated = review_card(card["id"], 4)  # 4 = engaged, count as review
-            next_review = datetime.fromisoformat(updated["next_review"]).strftime("%Y-%m-%d")
+            next_review = format_ts(updated["next_review"])
             print(f"\n   Recorded as reviewed (next: {next_review})\n")
         return
     
-    # Digest only
-    if args.digest:
-        print(format_digest(digest))
-        return
-    
     # Quiz only
     if args.quiz:
         print(format_quiz(quiz))
@@ -8,15 +8,13 @@ Usage:
 Logs to: cursor-web-search/CURSOR-WEB_YYYY-DD-MM_NN.md (splits at 5MB)
 """
 
+import functools
 import os
 import sys
 import re
 import glob
 from datetime import datetime
 from pathlib import Path
-from dotenv import load_dotenv
-from google import genai
-from google.genai import types
 
 MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB in bytes
 
@@ -70,11 +68,22 @@ def append_to_log(query: str, summary: str) -> Path:
     return log_path
 
 
+@functools.lru_cache(maxsize=1)
+def _client(api_key: str) -> "genai.Client":
+    """Gemini client for api_key, built once and reused across search() calls."""
+    from google import genai
+    return genai.Client(api_key=api_key)
+
+
 def search(query: str) -> str:
     """
     Performs a Google Search using Gemini's grounding capabilities.
     Returns real-time web results.
     """
+    # Deferred: google.genai alone takes hundreds of ms to import
+    from dotenv import load_dotenv
+    from google.genai import types
+
     load_dotenv()
     
     api_key = os.environ.get("GEMINI_API_KEY")
@@ -82,8 +91,7 @@ def search(query: str) -> str:
         return "Error: GEMINI_API_KEY not set"
     
     try:
-        client = genai.Client(api_key=api_key)
-        response = client.models.generate_content(
+        response = _client(api_key).models.generate_content(
             model="gemini-2.0-flash",
             contents=query,
             config=types.GenerateContentConfig(
@@ -4,6 +4,11 @@ Tests for cursor_usage.py
 
 Tests:
 - Import command
+- Import duplicate skip
+- Cycle aggregates (SQL-side)
+- Daily rollup
+- Fast import (sqlite3 CLI)
+- ts_epoch backfill
 - Report command
 - Quota command
 - Budget command
@@ -13,10 +18,12 @@ Tests:
 
 import sys
 import os
+import io
 import subprocess
 import tempfile
 import csv
 import shutil
+from contextlib import redirect_stderr, redirect_stdout
 from pathlib import Path
 from datetime import datetime
 
@@ -24,10 +31,11 @@ from datetime import datetime
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 SCRIPT_PATH = Path(__file__).parent.parent / "cursor-scripts" / "cursor_usage.py"
+sys.path.insert(0, str(SCRIPT_PATH.parent))
 
 
 def run_command(cmd: list) -> tuple[int, str, str]:
-    """Run a command and return (returncode, stdout, stderr)."""
+    """Run the script in a subprocess and return (returncode, stdout, stderr); CLI smoke test only."""
     result = subprocess.run(
         [sys.executable, str(SCRIPT_PATH)] + cmd,
         capture_output=True,
@@ -114,10 +122,185 @@ def test_import():
     return True
 
 
+def use_temp_db():
+    """Patch cursor_usage module to use a temp usage dir; return (tmp_path, module)."""
+    tmp = Path(tempfile.mkdtemp())
+    import cursor_usage as mod
+    mod.close_db()
+    mod.USAGE_DIR = tmp
+    mod.DB_PATH = tmp / "usage.db"
+    mod.REMINDER_STATE_PATH = tmp / ".reminder_last_date"
+    return tmp, mod
+
+
+def run_main(cmd: list) -> tuple[int, str, str]:
+    """Run cursor_usage.main() in-process on a temp usage dir; return (returncode, stdout, stderr)."""
+    tmp, usage = use_temp_db()
+    out, err = io.StringIO(), io.StringIO()
+    old_argv = sys.argv
+    sys.argv = [str(SCRIPT_PATH)] + cmd
+    returncode = 0
+    try:
+        with redirect_stdout(out), redirect_stderr(err):
+            usage.main()
+    except SystemExit as e:
+        returncode = e.code if isinstance(e.code, int) else int(e.code is not None)
+    finally:
+        sys.argv = old_argv
+        usage.close_db()
+        shutil.rmtree(tmp, ignore_errors=True)
+    return returncode, out.getvalue(), err.getvalue()
+
+
+def test_import_skips_duplicates():
+    """Test that re-importing the same CSV skips every row."""
+    print("Testing import duplicate skip...")
+    csv_file = create_sample_csv()
+    tmp, usage = use_temp_db()
+    try:
+        db = usage.get_db()
+        first = usage.import_csv(csv_file, db)
+        second = usage.import_csv(csv_file, db)
+        count = db.execute("SELECT COUNT(*) FROM usage_events").fetchone()[0]
+        if first != (2, 0):
+            print(f"❌ First import expected (2, 0), got {first}")
+            return False
+        if second != (0, 2):
+            print(f"❌ Re-import expected (0, 2), got {second}")
+            return False
+        if count != 2:
+            print(f"❌ Expected 2 records, got {count}")
+            return False
+        print("✅ Import duplicate skip passed")
+        return True
+    finally:
+        usage.close_db()
+        shutil.rmtree(tmp, ignore_errors=True)
+        shutil.rmtree(csv_file.parent, ignore_errors=True)
+
+
+def test_cycle_aggregates():
+    """Test SQL-side cycle aggregation splits cost by kind and model."""
+    print("Testing cycle aggregates...")
+    csv_file = create_sample_csv()
+    tmp, usage = use_temp_db()
+    try:
+        db = usage.get_db()
+        usage.import_csv(csv_file, db)
+        start, end = datetime(2026, 1, 14), datetime(2026, 2, 14)
+        total_cost, total_requests, model_stats, billable_cost, included_cost, total_tokens = (
+            usage.cycle_aggregates(db, start, end, by_model=True)
+        )
+        if total_requests != 2 or round(total_cost, 2) != 0.60 or total_tokens != 4450:
+            print(f"❌ Unexpected totals: {total_requests}, {total_cost}, {total_tokens}")
+            return False
+        if billable_cost != 0 or round(included_cost, 2) != 0.60:
+            print(f"❌ Unexpected kind split: billable={billable_cost}, included={included_cost}")
+            return False
+        if set(model_stats) != {"auto", "claude-4.5-opus-high-thinking"}:
+            print(f"❌ Unexpected models: {sorted(model_stats)}")
+            return False
+        _, _, no_models, _, _, _ = usage.cycle_aggregates(db, start, end)
+        if no_models:
+            print("❌ Model breakdown should be skipped without by_model")
+            return False
+        print("✅ Cycle aggregates passed")
+        return True
+    finally:
+        usage.close_db()
+        shutil.rmtree(tmp, ignore_errors=True)
+        shutil.rmtree(csv_file.parent, ignore_errors=True)
+
+
+def test_daily_rollup():
+    """Test daily_rollup is maintained on import and not double-counted on re-import."""
+    print("Testing daily rollup...")
+    csv_file = create_sample_csv()
+    tmp, usage = use_temp_db()
+    try:
+        db = usage.get_db()
+        usage.import_csv(csv_file, db)
+        usage.import_csv(csv_file, db)
+        rows = [tuple(r) for r in db.execute("SELECT date, count, ROUND(cost, 2), tokens FROM daily_rollup")]
+        if rows != [("2026-01-25", 2, 0.6, 4450)]:
+            print(f"❌ Unexpected rollup rows: {rows}")
+            return False
+        print("✅ Daily rollup passed")
+        return True
+    finally:
+        usage.close_db()
+        shutil.rmtree(tmp, ignore_errors=True)
+        shutil.rmtree(csv_file.parent, ignore_errors=True)
+
+
+def test_import_fast():
+    """Test the sqlite3 CLI bulk-load path matches the standard import."""
+    print("Testing fast import...")
+    csv_file = create_sample_csv()
+    tmp, usage = use_temp_db()
+    try:
+        db = usage.get_db()
+        if not shutil.which("sqlite3"):
+            if usage.import_csv_fast(csv_file, db) is not None:
+                print("❌ Fast import should return None without the sqlite3 CLI")
+                return False
+            print("⚠️  sqlite3 CLI not found (fallback path only)")
+            return True
+        first = usage.import_csv_fast(csv_file, db)
+        second = usage.import_csv_fast(csv_file, db)
+        if first != (2, 0) or second != (0, 2):
+            print(f"❌ Fast import counts unexpected: {first}, {second}")
+            return False
+        row = db.execute("SELECT typeof(cost), typeof(total_tokens) FROM usage_events LIMIT 1").fetchone()
+        if tuple(row) != ("real", "integer"):
+            print(f"❌ Fast import column types unexpected: {tuple(row)}")
+            return False
+        print("✅ Fast import passed")
+        return True
+    finally:
+        usage.close_db()
+        shutil.rmtree(tmp, ignore_errors=True)
+        shutil.rmtree(csv_file.parent, ignore_errors=True)
+
+
+def test_ts_epoch_backfill():
+    """Test get_db adds and backfills ts_epoch on a pre-existing database."""
+    print("Testing ts_epoch backfill...")
+    import sqlite3
+    tmp, usage = use_temp_db()
+    try:
+        old = sqlite3.connect(usage.DB_PATH)
+        old.execute("""
+            CREATE TABLE usage_events (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT UNIQUE, kind TEXT,
+                model TEXT, max_mode TEXT, input_cache_write INTEGER, input_no_cache INTEGER,
+                cache_read INTEGER, output_tokens INTEGER, total_tokens INTEGER, cost REAL,
+                imported_at TEXT
+            )
+        """)
+        old.execute(
+            "INSERT INTO usage_events (timestamp, model, cost, total_tokens) VALUES (?, ?, ?, ?)",
+            ("2026-01-25T10:00:00.000Z", "auto", 0.1, 850),
+        )
+        old.commit()
+        old.close()
+        db = usage.get_db()
+        epoch = db.execute("SELECT ts_epoch FROM usage_events").fetchone()[0]
+        expected = usage.to_epoch(datetime(2026, 1, 25, 10, 0, 0))
+        if epoch != expected:
+            print(f"❌ Expected ts_epoch {expected}, got {epoch}")
+            return False
+        print("✅ ts_epoch backfill passed")
+        return True
+    finally:
+        usage.close_db()
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
 def test_report():
     """Test report command."""
     print("Testing report command...")
-    returncode, stdout, stderr = run_command(["report"])
+    returncode, stdout, stderr = run_main(["report"])
     
     if returncode != 0:
         # Check if it's just a "no data" case
@@ -135,7 +318,7 @@ def test_report():
 def test_quota():
     """Test quota command."""
     print("Testing quota command...")
-    returncode, stdout, stderr = run_command(["quota"])
+    returncode, stdout, stderr = run_main(["quota"])
     
     if returncode != 0:
         print(f"❌ Quota failed: {stderr}")
@@ -152,7 +335,7 @@ def test_quota():
 def test_budget():
     """Test budget command."""
     print("Testing budget command...")
-    returncode, stdout, stderr = run_command(["budget"])
+    returncode, stdout, stderr = run_main(["budget"])
     
     if returncode != 0:
         print(f"❌ Budget failed: {stderr}")
@@ -165,7 +348,7 @@ def test_budget():
 def test_alerts():
     """Test alerts command."""
     print("Testing alerts command...")
-    returncode, stdout, stderr = run_command(["alerts", "--warn", "50", "--fail", "90"])
+    returncode, stdout, stderr = run_main(["alerts", "--warn", "50", "--fail", "90"])
     
     # Exit code 0, 1, or 2 are all valid (0=ok, 1=warn, 2=fail)
     if returncode > 2:
@@ -179,7 +362,7 @@ def test_alerts():
 def test_reminder():
     """Test reminder command."""
     print("Testing reminder command...")
-    returncode, stdout, stderr = run_command(["reminder", "--no-stamp"])
+    returncode, stdout, stderr = run_main(["reminder", "--no-stamp"])
     
     if returncode != 0:
         print(f"❌ Reminder failed: {stderr}")
@@ -192,6 +375,11 @@ def test_reminder():
 def main():
     tests = [
         test_import,
+        test_import_skips_duplicates,
+        test_cycle_aggregates,
+        test_daily_rollup,
+        test_import_fast,
+        test_ts_epoch_backfill,
         test_report,
         test_quota,
         test_budget,
@@ -10,6 +10,11 @@ Tests:
 - Quiz answer/skip with no state
 - Full quiz flow (start -> answer -> complete)
 - Review card updates schedule
+- Legacy flashcards.json migrates into SQLite
+- CardStore commits once on exit, rolls back on error
+- Markdown export/import round trip
+- Random card by source file (substring, glob, bracketed literal path)
+- SM-2 update kernel
 """
 
 import sys
@@ -30,6 +35,7 @@ def use_temp_data():
     tmp = Path(tempfile.mkdtemp())
     import review as mod
     mod.DATA_DIR = tmp
+    mod.FLASHCARDS_DB = tmp / "flashcards.db"
     mod.FLASHCARDS_FILE = tmp / "flashcards.json"
     mod.QUIZ_STATE_FILE = tmp / ".quiz_state.json"
     return tmp, mod
@@ -64,7 +70,7 @@ def test_add_and_load():
         print("✅ Add and load passed")
         return True
     finally:
-        tmp.exists() and tmp.joinpath("flashcards.json").unlink(missing_ok=True)
+        tmp.exists() and tmp.joinpath("flashcards.db").unlink(missing_ok=True)
 
 
 def test_digest():
@@ -84,7 +90,7 @@ def test_digest():
         print("✅ Digest/stats passed")
         return True
     finally:
-        tmp.joinpath("flashcards.json").unlink(missing_ok=True)
+        tmp.joinpath("flashcards.db").unlink(missing_ok=True)
 
 
 def test_quiz_start_no_cards():
@@ -135,7 +141,7 @@ def test_quiz_start_practice_with_cards():
         return True
     finally:
         review.clear_quiz_state()
-        tmp.joinpath("flashcards.json").unlink(missing_ok=True)
+        tmp.joinpath("flashcards.db").unlink(missing_ok=True)
 
 
 def test_quiz_answer_no_state():
@@ -194,7 +200,7 @@ def test_full_quiz_flow():
         return True
     finally:
         review.clear_quiz_state()
-        tmp.joinpath("flashcards.json").unlink(missing_ok=True)
+        tmp.joinpath("flashcards.db").unlink(missing_ok=True)
 
 
 def test_review_card_updates_schedule():
@@ -202,18 +208,152 @@ def test_review_card_updates_schedule():
     print("Testing review_card updates schedule...")
     tmp, review = use_temp_data()
     try:
-        from datetime import datetime, timedelta
         card = review.add_card("Schedule Q?", "Schedule A", "general")
-        before = datetime.fromisoformat(card["next_review"])
+        before = card["next_review"]
         updated = review.review_card(card["id"], 4)
-        after = datetime.fromisoformat(updated["next_review"])
-        if after <= before:
-            print(f"❌ next_review should increase after review, got {before} -> {after}")
+        after = updated["next_review"]
+        if after - updated["last_review"] != 86400 or after <= before:
+            print(f"❌ next_review should be last_review + 1 day, got {before} -> {after} (last_review {updated['last_review']})")
             return False
         print("✅ Review card schedule passed")
         return True
     finally:
-        tmp.joinpath("flashcards.json").unlink(missing_ok=True)
+        tmp.joinpath("flashcards.db").unlink(missing_ok=True)
+
+
+def test_legacy_json_migration():
+    """Test that an existing flashcards.json is imported into a new database."""
+    print("Testing legacy JSON migration...")
+    tmp, review = use_temp_data()
+    try:
+        import json
+        from datetime import date, datetime
+        card = {
+            "id": "20240101120000123", "question": "Legacy Q?", "answer": "Legacy A",
+            "category": "tool", "tags": ["old"], "source": None,
+            "created": "2024-01-01T12:00:00", "last_review": None,
+            "next_review": "2024-01-01T12:00:00", "ease_factor": 2.5,
+            "interval": 0, "repetitions": 0, "total_reviews": 0,
+        }
+        legacy = {
+            "cards": [card, dict(card, question="Same-second Q?")],
+            "stats": {"total_reviews": 7, "streak_days": 3, "last_review_date": "2024-01-01"},
+        }
+        review.FLASHCARDS_FILE.write_text(json.dumps(legacy))
+        data = review.load_cards()
+        if [c["question"] for c in data["cards"]] != ["Legacy Q?", "Same-second Q?"]:
+            print(f"❌ Expected both legacy cards, got {data['cards']}")
+            return False
+        ts = int(datetime(2024, 1, 1, 12).timestamp())
+        if data["cards"][0] != dict(card, created=ts, next_review=ts):
+            print(f"❌ Migrated card mismatch: {data['cards'][0]}")
+            return False
+        want_stats = {"total_reviews": 7, "streak_days": 3, "last_review_date": date(2024, 1, 1).toordinal()}
+        if data["stats"] != want_stats:
+            print(f"❌ Migrated stats mismatch: {data['stats']}")
+            return False
+        print("✅ Legacy JSON migration passed")
+        return True
+    finally:
+        tmp.joinpath("flashcards.db").unlink(missing_ok=True)
+
+
+def test_card_store_transaction():
+    """Test that CardStore shares one connection and rolls back on error."""
+    print("Testing CardStore transaction...")
+    tmp, review = use_temp_data()
+    try:
+        with review.CardStore() as store:
+            store.add("Kept Q?", "Kept A")
+            if len(review.list_cards()) != 1:
+                print("❌ Nested helper did not see the open store's card")
+                return False
+        try:
+            with review.CardStore() as store:
+                store.add("Dropped Q?", "Dropped A")
+                raise RuntimeError("boom")
+        except RuntimeError:
+            pass
+        questions = [c["question"] for c in review.list_cards()]
+        if questions != ["Kept Q?"]:
+            print(f"❌ Expected only the committed card, got {questions}")
+            return False
+        print("✅ CardStore transaction passed")
+        return True
+    finally:
+        tmp.joinpath("flashcards.db").unlink(missing_ok=True)
+
+
+def test_markdown_round_trip():
+    """Test that export_to_markdown output imports back unchanged."""
+    print("Testing markdown round trip...")
+    tmp, review = use_temp_data()
+    try:
+        review.add_card("RT Q1?", "RT A1", "dev", ["py", "cli"], "src/app.py")
+        review.add_card("RT Q2?", "RT A2", "tool")
+        md_path = tmp / "export.md"
+        md_path.write_text(review.export_to_markdown())
+        review.FLASHCARDS_DB = tmp / "imported.db"
+        count = review.import_from_markdown(str(md_path))
+        if count != 2:
+            print(f"❌ Expected 2 imported cards, got {count}")
+            return False
+        got = [(c["question"], c["answer"], c["category"], c["tags"], c["source"]) for c in review.list_cards()]
+        want = [("RT Q1?", "RT A1", "dev", ["py", "cli"], "src/app.py"), ("RT Q2?", "RT A2", "tool", [], None)]
+        if sorted(got) != sorted(want):
+            print(f"❌ Round trip mismatch: {got}")
+            return False
+        print("✅ Markdown round trip passed")
+        return True
+    finally:
+        tmp.joinpath("flashcards.db").unlink(missing_ok=True)
+        tmp.joinpath("imported.db").unlink(missing_ok=True)
+
+
+def test_random_from_files():
+    """Test get_random_card source filtering by substring, glob and bracketed literal paths."""
+    print("Testing random card from files...")
+    tmp, review = use_temp_data()
+    try:
+        review.add_card("Py Q?", "Py A", "dev", source="src/app.py")
+        review.add_card("Md Q?", "Md A", "dev", source="docs/guide.md")
+        review.add_card("Route Q?", "Route A", "dev", source="app/[id]/page.tsx")
+        for pattern, want in (
+            ("app.py", "Py Q?"), ("*.md", "Md Q?"), ("src/*", "Py Q?"),
+            ("app/[id]/page.tsx", "Route Q?"),  # Literal git path, not a character class
+        ):
+            card = review.get_random_card(from_files=[pattern])
+            if not card or card["question"] != want:
+                print(f"❌ {pattern!r} should pick {want!r}, got {card and card['question']}")
+                return False
+        # No match falls back to any card
+        if not review.get_random_card(from_files=["*.rs"]):
+            print("❌ Unmatched pattern should fall back to a random card")
+            return False
+        print("✅ Random from files passed")
+        return True
+    finally:
+        tmp.joinpath("flashcards.db").unlink(missing_ok=True)
+
+
+def test_sm2_update():
+    """Test the pure SM-2 step on pass, fail and ease floor."""
+    print("Testing sm2_update...")
+    _, review = use_temp_data()
+    cases = [
+        ((4, 0, 0, 2.5), (1, 1, 2.5)),
+        ((4, 1, 1, 2.5), (2, 6, 2.5)),
+        ((5, 2, 6, 2.5), (3, 15, 2.6)),
+        ((1, 3, 15, 2.5), (0, 1, 1.96)),
+        ((0, 3, 15, 1.3), (0, 1, 1.3)),
+    ]
+    for args, (reps, interval, ease) in cases:
+        got = review.sm2_update(*args)
+        if got[:2] != (reps, interval) or abs(got[2] - ease) > 1e-9:
+            print(f"❌ sm2_update{args} = {got}, expected {(reps, interval, ease)}")
+            return False
+    print("✅ sm2_update passed")
+    return True
 
 
 def main():
@@ -228,6 +368,11 @@ def main():
         test_quiz_skip_no_state,
         test_full_quiz_flow,
         test_review_card_updates_schedule,
+        test_legacy_json_migration,
+        test_card_store_transaction,
+        test_markdown_round_trip,
+        test_random_from_files,
+        test_sm2_update,
     ]
     passed = 0
     for test in tests:
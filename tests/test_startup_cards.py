@@ -5,6 +5,7 @@ Tests for startup_cards.py (daily digest and quiz/reveal).
 Tests:
 - Script exists
 - Digest format (get_digest, format_digest)
+- --digest skips quiz selection
 - Get quiz card (empty deck, with cards)
 - Reveal with no cached quiz
 - Reveal records as review for real cards
@@ -27,6 +28,7 @@ def use_temp_data():
     tmp = Path(tempfile.mkdtemp())
     import review
     review.DATA_DIR = tmp
+    review.FLASHCARDS_DB = tmp / "flashcards.db"
     review.FLASHCARDS_FILE = tmp / "flashcards.json"
     review.QUIZ_STATE_FILE = tmp / ".quiz_state.json"
     import startup_cards as sc
@@ -64,6 +66,26 @@ def test_digest_format():
         pass
 
 
+def test_digest_skips_quiz():
+    """Test that --digest prints the digest without picking (and caching) a quiz card."""
+    print("Testing --digest skips quiz...")
+    tmp, sc = use_temp_data()
+    old_argv = sys.argv
+    try:
+        import review
+        review.add_card("Digest Q?", "Digest A", "general")
+        sys.argv = [str(SCRIPT_PATH), "--digest"]
+        sc.main()
+        if sc.QUIZ_CACHE_FILE.exists():
+            print("❌ --digest should not pick or cache a quiz card")
+            return False
+        print("✅ --digest skips quiz passed")
+        return True
+    finally:
+        sys.argv = old_argv
+        tmp.joinpath("flashcards.db").unlink(missing_ok=True)
+
+
 def test_get_quiz_card_empty():
     """Test get_quiz_card with empty deck."""
     print("Testing get quiz card (empty deck)...")
@@ -96,7 +118,7 @@ def test_get_quiz_card_with_cards():
         print("✅ Get quiz card (with cards) passed")
         return True
     finally:
-        tmp.joinpath("flashcards.json").unlink(missing_ok=True)
+        tmp.joinpath("flashcards.db").unlink(missing_ok=True)
 
 
 def test_reveal_no_quiz():
@@ -133,15 +155,14 @@ def test_reveal_records_review():
         if not updated.get("next_review"):
             print("❌ review_card did not set next_review")
             return False
-        from datetime import datetime
-        next_dt = datetime.fromisoformat(updated["next_review"])
-        if next_dt <= datetime.now():
+        import time
+        if updated["next_review"] <= time.time():
             print("❌ next_review should be in future after review")
             return False
         print("✅ Reveal records review passed")
         return True
     finally:
-        tmp.joinpath("flashcards.json").unlink(missing_ok=True)
+        tmp.joinpath("flashcards.db").unlink(missing_ok=True)
         tmp.joinpath(".current_quiz.json").unlink(missing_ok=True)
 
 
@@ -149,6 +170,7 @@ def main():
     tests = [
         test_script_exists,
         test_digest_format,
+        test_digest_skips_quiz,
         test_get_quiz_card_empty,
         test_get_quiz_card_with_cards,
         test_reveal_no_quiz,